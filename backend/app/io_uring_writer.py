@@ -0,0 +1,101 @@
+"""io_uring-backed file writes for storing uploads on Linux.
+
+Requires the optional ``liburing`` package and a kernel with io_uring (5.6+). Callers check
+``available()`` and fall back to plain ``open().write()`` when it returns False.
+"""
+import atexit
+import sys
+import threading
+
+try:
+    import liburing
+except ImportError:
+    liburing = None
+
+QUEUE_DEPTH = 64
+
+_local = threading.local()
+_available = None
+
+
+class _Ring:
+    """A thread's ring and completion entry.
+
+    Torn down with io_uring_queue_exit on close(), or when the thread exits and its locals
+    (and so this object) are released.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.ring = liburing.Ring()
+        self.cqe = liburing.Cqe()
+        liburing.io_uring_queue_init(QUEUE_DEPTH, self.ring)
+        self.active = True
+
+    def close(self) -> None:
+        if self.active:
+            self.active = False
+            liburing.io_uring_queue_exit(self.ring)
+
+    def __del__(self):
+        self.close()
+
+
+def available() -> bool:
+    """Whether io_uring writes work here; probed on the first call and remembered for the process."""
+    global _available
+    if _available is None:
+        if liburing is None or sys.platform != "linux":
+            _available = False
+        else:
+            try:
+                _ring()
+                _available = True
+            except OSError:
+                # io_uring compiled out or blocked (e.g. by a seccomp profile)
+                _available = False
+    return _available
+
+
+def _ring() -> _Ring:
+    """This thread's ring, set up once and reused for every later write on the thread."""
+    ring = getattr(_local, "ring", None)
+    if ring is None:
+        ring = _local.ring = _Ring()
+    return ring
+
+
+def close() -> None:
+    """Tear down the calling thread's ring, if it has one."""
+    ring = getattr(_local, "ring", None)
+    if ring is not None:
+        del _local.ring
+        ring.close()
+
+
+# worker threads release their rings on exit; the main thread's is closed here
+atexit.register(close)
+
+
+def write_at(fd: int, data: bytes, offset: int) -> int:
+    """Write all of `data` to `fd` at `offset`, resubmitting short writes. Returns bytes written."""
+    r = _ring()
+    ring, cqe = r.ring, r.cqe
+    buf = data
+    total = 0
+    while buf:
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_write(sqe, fd, buf, offset + total)
+        liburing.io_uring_submit(ring)
+        liburing.io_uring_wait_cqe(ring, cqe)
+        entry = cqe[0]
+        try:
+            written = liburing.trap_error(entry.res)
+        finally:
+            liburing.io_uring_cqe_seen(ring, entry)
+        if written == 0:
+            raise OSError("io_uring write made no progress")
+        # liburing takes bytes-like objects but not memoryviews, so a short write copies the rest
+        buf = buf[written:]
+        total += written
+    return total
@@ -1,14 +1,21 @@
 import os
 from fastapi import FastAPI, UploadFile, File, HTTPException, Depends
-from fastapi.responses import JSONResponse, FileResponse
-from sqlalchemy.orm import Session
-from . import models, schemas
-from .database import engine, Base, get_db
-from .utils import extract_text_from_pdf, extract_text_from_image, parse_cdr_text, extract_apm_from_text, extract_technical_table
-
+from fastapi.responses import FileResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models, schemas, io_uring_writer
+from .database import engine, Base, get_db, get_async_db
+from .utils import OCR_POOL_WORKERS, TEXT_EXTRACTION_VERSION, extract_text_from_pdf, extract_text_from_image, parse_cdr_text, extract_apm_from_text, extract_technical_table
+
+import asyncio
 import shutil
 import uuid
 import json
+import math
+import re
+import orjson
+import hashlib
 
 
 
@@ -16,6 +23,11 @@ app = FastAPI(title="CDR Extraction API")
 
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# caps concurrent text extractions: each admitted job runs ~4 tesseract threads in-process or
+# feeds the shared OCR pool, which is sized the same way, so tesseract never oversubscribes the cores
+_ocr_sem = asyncio.Semaphore(OCR_POOL_WORKERS)
 
 
 def _merge_dicts(orig: dict, new: dict) -> dict:
@@ -39,12 +51,113 @@ def _merge_dicts(orig: dict, new: dict) -> dict:
     return merged
 
 
+# orjson parses integers past 64 bits as floats; any run this long falls back to json
+_LONG_DIGITS = re.compile(r"\d{20}")
+
+
+def _has_nonfinite(obj) -> bool:
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_nonfinite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_nonfinite(v) for v in obj)
+    return False
+
+
+def _dumps(obj) -> str:
+    """Serialize a parsed_json value with orjson, or with json for what orjson can't represent.
+
+    orjson rejects integers beyond 64 bits and non-str keys, and writes NaN/Infinity as null.
+    """
+    try:
+        out = orjson.dumps(obj)
+    except orjson.JSONEncodeError:
+        return json.dumps(obj)
+    if b"null" in out and _has_nonfinite(obj):
+        return json.dumps(obj)
+    return out.decode()
+
+
+def _loads(s: str):
+    """Parse a stored parsed_json value; rows with big integers or NaN (as json writes them) go through json."""
+    if _LONG_DIGITS.search(s) is None:
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(s)
+
+
+async def _run_ocr(func, *args):
+    """Run a blocking text extraction (OCR) call on a worker thread, bounded by _ocr_sem."""
+    async with _ocr_sem:
+        return await asyncio.to_thread(func, *args)
+
+
+def _store_upload(src, saved_path: str):
+    """Copy an upload to disk in UPLOAD_CHUNK_SIZE chunks.
+
+    Returns (size, sha256 hex digest), both computed from the streamed chunks.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    # on Linux with liburing installed, chunks go through io_uring; otherwise plain writes
+    use_uring = io_uring_writer.available()
+    with open(saved_path, "wb") as out:
+        while True:
+            chunk = src.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            if use_uring:
+                io_uring_writer.write_at(out.fileno(), chunk, size)
+            else:
+                out.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest()
+
+
+def _extract_text(saved_path: str, file_ext: str) -> str:
+    if file_ext == ".pdf":
+        return extract_text_from_pdf(saved_path)
+    return extract_text_from_image(saved_path)
+
+
+def _text_cache_key(content_hash: str) -> str:
+    # keyed on the extraction version too, so text cached before an OCR/extraction change is never hit
+    return hashlib.sha256(f"{TEXT_EXTRACTION_VERSION}:{content_hash}".encode()).hexdigest()
+
+
+async def _get_cached_text(db: AsyncSession, content_hash: str):
+    """Return the text extracted earlier from an upload with this SHA-256, or None on a miss."""
+    result = await db.execute(select(models.TextCache).where(models.TextCache.hash == _text_cache_key(content_hash)))
+    entry = result.scalars().first()
+    return (entry.text or "") if entry else None
+
+
+async def _put_cached_text(db: AsyncSession, content_hash: str, text: str) -> None:
+    """Store the extracted text for an upload hash, in its own transaction.
+
+    Called after the upload itself is committed and never raises: when a concurrent upload of
+    the same bytes inserts the row first, the primary key conflict just drops this write.
+    """
+    if not text:
+        # don't pin a failed extraction; let the next upload retry OCR
+        return
+    try:
+        db.add(models.TextCache(hash=_text_cache_key(content_hash), text=text))
+        await db.commit()
+    except Exception:
+        await db.rollback()
+
+
 # NOTE: the previous /upload endpoint has been removed. Use /extract-apm to upload
 # and persist APM extraction results directly to the database.
 
 
 @app.post("/extract-apm")
-async def extract_apm(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def extract_apm(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
     """Upload a file, extract APM details and persist the file + CDR (parsed_json).
 
     This replaces the old /upload endpoint: the extracted APM JSON is stored in
@@ -56,57 +169,52 @@ async def extract_apm(file: UploadFile = File(...), db: Session = Depends(get_db
     saved_name = f"{uid}{file_ext}"
     saved_path = os.path.join(UPLOAD_DIR, saved_name)
 
-    # save uploaded file to uploads folder
-    with open(saved_path, "wb") as out:
-        content = await file.read()
-        out.write(content)
-
-    size = os.path.getsize(saved_path)
-
-    # create File record
-    db_file = models.File(filename=file.filename, path=saved_path, size=size)
-    db.add(db_file)
-    db.commit()
-    db.refresh(db_file)
+    # stream uploaded file to uploads folder (off the event loop, never fully in memory)
+    size, content_hash = await asyncio.to_thread(_store_upload, file.file, saved_path)
 
     try:
-        # extract text for parsing
-        text = ""
-        if file_ext == ".pdf":
-            text = extract_text_from_pdf(saved_path)
-        else:
-            text = extract_text_from_image(saved_path)
+        # extract text for parsing, skipping OCR when this exact file was seen before
+        text = await _get_cached_text(db, content_hash)
+        extracted = text is None
+        if extracted:
+            text = await _run_ocr(_extract_text, saved_path, file_ext)
 
         # run APM extractor
-        apm = extract_apm_from_text(text)
+        apm = await asyncio.to_thread(extract_apm_from_text, text)
+
+        # create File record; flush assigns db_file.id without committing
+        db_file = models.File(filename=file.filename, path=saved_path, size=size)
+        db.add(db_file)
+        await db.flush()
 
         # persist CDR with APM JSON
-        cdr = models.Cdr(file_id=db_file.id, parsed_text=text, parsed_json=json.dumps(apm), status="draft")
+        cdr = models.Cdr(file_id=db_file.id, parsed_text=text, parsed_json=_dumps(apm), status="draft")
         db.add(cdr)
-        db.commit()
-        db.refresh(cdr)
-
-        return JSONResponse({"filename": file.filename, "file_id": db_file.id, "cdr_id": cdr.id, "apm": apm})
-    except Exception as e:
-        # If anything fails, cleanup DB file record and saved file
-        try:
-            db.delete(db_file)
-            db.commit()
-        except Exception:
-            pass
+        await db.commit()
+    except Exception:
+        # File and CDR share one transaction, so rolling back leaves no orphan File record
+        await db.rollback()
         raise
 
+    # read the ids before the cache write, whose rollback on a conflict expires these objects
+    response = {"filename": file.filename, "file_id": db_file.id, "cdr_id": cdr.id, "apm": apm}
+    if extracted:
+        await _put_cached_text(db, content_hash, text)
+
+    return response
+
 
 @app.get("/files/{file_id}")
 def get_file(file_id: int, db: Session = Depends(get_db)):
-    f = db.query(models.File).filter(models.File.id == file_id).first()
+    # load the 1:1 cdr in the same query instead of a lazy second SELECT
+    f = db.query(models.File).options(joinedload(models.File.cdr)).filter(models.File.id == file_id).first()
     if not f:
         raise HTTPException(status_code=404, detail="File not found")
     cdr = f.cdr
     parsed = {}
     if cdr and cdr.parsed_json:
         try:
-            parsed = json.loads(cdr.parsed_json)
+            parsed = _loads(cdr.parsed_json)
         except Exception:
             parsed = {}
 
@@ -134,7 +242,7 @@ def confirm_cdr(cdr_id: int, payload: schemas.CdrConfirm, db: Session = Depends(
     existing_parsed = {}
     if c.parsed_json:
         try:
-            existing_parsed = json.loads(c.parsed_json)
+            existing_parsed = _loads(c.parsed_json)
         except Exception:
             existing_parsed = {}
     # If the incoming payload parsed_json is empty ({}), preserve existing parsed JSON.
@@ -150,7 +258,7 @@ def confirm_cdr(cdr_id: int, payload: schemas.CdrConfirm, db: Session = Depends(
         new_parsed_json = _merge_dicts(existing_parsed, incoming)
 
     # store final JSON and mark confirmed
-    c.parsed_json = json.dumps(new_parsed_json)
+    c.parsed_json = _dumps(new_parsed_json)
     c.status = payload.status or "confirmed"
     db.add(c)
     db.commit()
@@ -158,7 +266,7 @@ def confirm_cdr(cdr_id: int, payload: schemas.CdrConfirm, db: Session = Depends(
 
     saved_parsed = {}
     try:
-        saved_parsed = json.loads(c.parsed_json) if c.parsed_json else {}
+        saved_parsed = _loads(c.parsed_json) if c.parsed_json else {}
     except Exception:
         saved_parsed = {}
 
@@ -180,7 +288,7 @@ def get_cdr_parsed(cdr_id: int, db: Session = Depends(get_db)):
     parsed = {}
     if c.parsed_json:
         try:
-            parsed = json.loads(c.parsed_json)
+            parsed = _loads(c.parsed_json)
         except Exception:
             parsed = {}
 
@@ -188,7 +296,7 @@ def get_cdr_parsed(cdr_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/extract-techspec")
-async def extract_techspec(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def extract_techspec(file: UploadFile = File(...), db: AsyncSession = Depends(get_async_db)):
     """Upload a file, extract only the Technical Specifications and persist a CDR with
     parsed_json containing only the technical_spec key. Returns the extracted technical_spec.
     """
@@ -197,46 +305,39 @@ async def extract_techspec(file: UploadFile = File(...), db: Session = Depends(g
     saved_name = f"{uid}{file_ext}"
     saved_path = os.path.join(UPLOAD_DIR, saved_name)
 
-    # save uploaded file to uploads folder
-    with open(saved_path, "wb") as out:
-        content = await file.read()
-        out.write(content)
-
-    size = os.path.getsize(saved_path)
-
-    # create File record
-    db_file = models.File(filename=file.filename, path=saved_path, size=size)
-    db.add(db_file)
-    db.commit()
-    db.refresh(db_file)
+    # stream uploaded file to uploads folder (off the event loop, never fully in memory)
+    size, content_hash = await asyncio.to_thread(_store_upload, file.file, saved_path)
 
     try:
-        # extract text for parsing
-        text = ""
-        if file_ext == ".pdf":
-            text = extract_text_from_pdf(saved_path)
-        else:
-            text = extract_text_from_image(saved_path)
+        # extract text for parsing, skipping OCR when this exact file was seen before
+        text = await _get_cached_text(db, content_hash)
+        extracted = text is None
+        if extracted:
+            text = await _run_ocr(_extract_text, saved_path, file_ext)
 
-        techspec = extract_technical_table(text)
+        techspec = await asyncio.to_thread(extract_technical_table, text)
         # techspec is expected to be a dict of rows; use it directly as the technical_spec
         tech = techspec if isinstance(techspec, dict) else {}
 
+        # create File record; flush assigns db_file.id without committing
+        db_file = models.File(filename=file.filename, path=saved_path, size=size)
+        db.add(db_file)
+        await db.flush()
+
         # persist CDR with only technical_spec
-        cdr = models.Cdr(file_id=db_file.id, parsed_text=text, parsed_json=json.dumps({"technical_spec": tech}), status="draft")
+        cdr = models.Cdr(file_id=db_file.id, parsed_text=text, parsed_json=_dumps({"technical_spec": tech}), status="draft")
         db.add(cdr)
-        db.commit()
-        db.refresh(cdr)
-
-        return JSONResponse({"filename": file.filename, "file_id": db_file.id, "cdr_id": cdr.id, "technical_spec": tech})
-
+        await db.commit()
     except Exception:
-        # If anything fails, cleanup DB file record and saved file
-        try:
-            db.delete(db_file)
-            db.commit()
-        except Exception:
-            pass
+        # File and CDR share one transaction, so rolling back leaves no orphan File record
+        await db.rollback()
         raise
 
+    # read the ids before the cache write, whose rollback on a conflict expires these objects
+    response = {"filename": file.filename, "file_id": db_file.id, "cdr_id": cdr.id, "technical_spec": tech}
+    if extracted:
+        await _put_cached_text(db, content_hash, text)
+
+    return response
+
 Base.metadata.create_all(bind=engine)
@@ -20,10 +20,19 @@ class Cdr(Base):
     __tablename__ = "cdrs"
 
     id = Column(Integer, primary_key=True, index=True)
-    file_id = Column(Integer, ForeignKey("files.id"), nullable=False)
+    file_id = Column(Integer, ForeignKey("files.id"), index=True, nullable=False)
     parsed_text = Column(Text, nullable=True)
     parsed_json = Column(Text, nullable=True)
     status = Column(String(50), default="draft")
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
     file = relationship("File", back_populates="cdr")
+
+
+class TextCache(Base):
+    __tablename__ = "text_cache"
+
+    # SHA-256 of the uploaded file's bytes and the extraction version (see main._text_cache_key)
+    hash = Column(String(64), primary_key=True)
+    text = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,44 +1,301 @@
 import os
-from typing import Tuple
+from typing import Any, Tuple
 import io
 import re
+import threading
+import contextlib
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache, wraps
 
 
-def extract_text_from_pdf(path: str) -> str:
-    text_parts = []
+# bump whenever a change here alters extracted text, so text cached by main.py is re-extracted
+TEXT_EXTRACTION_VERSION = 1
+
+# OCR fallback for PDF pages without a text layer
+OCR_RESOLUTION = 150
+OCR_RETRY_RESOLUTION = 200
+OCR_PSM = 6  # single uniform block of text
+OCR_CONFIG = f"--psm {OCR_PSM} -c preserve_interword_spaces=1"
+# a page whose 150 DPI OCR reads fewer than MIN_PAGE_TEXT characters despite at least
+# MIN_PAGE_INK dark pixels (as a fraction of the page) is retried at OCR_RETRY_RESOLUTION
+MIN_PAGE_TEXT = 50
+MIN_PAGE_INK = 0.005
+
+_tess = threading.local()
+
+
+def _tess_api():
+    """This thread's tesserocr engine, or None when tesserocr isn't available.
+
+    Created on first use and kept for the thread's lifetime, so tesseract and its language data
+    are initialised once per thread (once per pool worker) instead of once per image.
+    """
+    if not hasattr(_tess, "api"):
+        try:
+            import tesserocr
+
+            _tess.api = tesserocr.PyTessBaseAPI()
+        except (ImportError, RuntimeError):
+            _tess.api = None
+    return _tess.api
+
+
+def _tess_ocr(api, image, psm: int, preserve_spaces: bool) -> str:
+    api.SetPageSegMode(psm)
+    api.SetVariable("preserve_interword_spaces", "1" if preserve_spaces else "0")
+    api.SetImage(image)
+    return api.GetUTF8Text()
+
+
+_pdfplumber = None
+
+
+def _get_pdfplumber():
+    """Import the PDF backend on first use (keeps it out of worker start-up) and remember it."""
+    global _pdfplumber
+    if _pdfplumber is None:
+        # prefer the Rust-backed pdfplumber-rs binding (same open()/pages/extract_text() API)
+        try:
+            import pdfplumber_rs as pdfplumber
+        except ImportError:
+            import pdfplumber
+        _pdfplumber = pdfplumber
+    return _pdfplumber
+
+
+def _open_pdf(path: str):
+    return _get_pdfplumber().open(path)
+
+
+def _open_rasterizer(path: str, pdf, page_numbers: list):
+    """Document handle for rendering the OCR pages, opened once per PDF.
+
+    pdfplumber pages rasterize themselves, so this is a no-op context yielding None there (and
+    when nothing needs rendering); pdfplumber-rs has no rasterizer, so the file is opened once
+    with PyMuPDF instead.
+    """
+    if not page_numbers or hasattr(pdf.pages[page_numbers[0]], "to_image"):
+        return contextlib.nullcontext()
     try:
-        # lazy imports so module import doesn't fail when testing parsing logic
-        import pdfplumber
+        import pymupdf
+
+        return pymupdf.open(path)
+    except Exception:
+        # without PyMuPDF the pages can't be rendered; _render_page fails and they're skipped
+        return contextlib.nullcontext()
+
+
+def _render_page(doc, page, page_number: int, resolution: int = OCR_RESOLUTION):
+    """Rasterize a single PDF page (0-based page_number) to a PIL image for OCR.
+
+    `doc` is the handle from _open_rasterizer: None to render with pdfplumber, else a PyMuPDF document.
+    """
+    if doc is None:
+        return page.to_image(resolution=resolution).original
+
+    from PIL import Image
+
+    pix = doc[page_number].get_pixmap(dpi=resolution)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def _ink_ratio(image) -> float:
+    """Fraction of dark pixels in a grayscale (mode L) page image."""
+    return sum(image.histogram()[:128]) / max(1, image.width * image.height)
+
+
+def _ocr_image_batch(batch: list) -> list:
+    """Process-pool worker: OCR a batch of (mode, size, raw bytes) images.
+
+    Uses the worker's persistent tesserocr engine when available. Otherwise multi-page batches
+    are written as PNGs plus a list file, which tesseract accepts in place of an image, so the
+    engine starts once per batch instead of once per page; the combined output is split back
+    into pages on tesseract's form-feed separator.
+    Returns one text per image, or None for every image when OCR fails.
+    """
+    try:
+        from PIL import Image
+
+        images = [Image.frombytes(mode, size, raw) for mode, size, raw in batch]
+        api = _tess_api()
+        if api is not None:
+            return [_tess_ocr(api, im, OCR_PSM, True) for im in images]
+
         import pytesseract
 
-        with pdfplumber.open(path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
+        if len(images) == 1:
+            return [pytesseract.image_to_string(images[0], config=OCR_CONFIG)]
+
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as workdir:
+            names = []
+            for n, im in enumerate(images):
+                name = os.path.join(workdir, f"page_{n}.png")
+                im.save(name)
+                names.append(name)
+            list_path = os.path.join(workdir, "imglist.txt")
+            with open(list_path, "w") as f:
+                f.write("\n".join(names) + "\n")
+            out = pytesseract.image_to_string(list_path, config=OCR_CONFIG)
+
+        pages = out.split("\f")
+        if len(pages) < len(images):
+            return [None] * len(batch)
+        return pages[: len(images)]
+    except Exception:
+        return [None] * len(batch)
+
+
+# tesseract already runs ~4 threads per instance, so give the pool a quarter of the cores
+OCR_POOL_WORKERS = max(1, (os.cpu_count() or 1) // 4)
+# pages rendered and held in memory at once, a few per worker so every batch stays sizeable
+OCR_WINDOW = OCR_POOL_WORKERS * 4
+
+_ocr_pool = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool():
+    """The shared OCR process pool, started on first use and kept for the process lifetime,
+    so each worker's tesserocr engine is reused across PDFs and retry passes."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn rather than fork: a forked child would inherit this thread's tesserocr engine
+            # (and its OpenMP state) mid-use
+            _ocr_pool = ProcessPoolExecutor(
+                max_workers=OCR_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _ocr_pool
+
+
+def _discard_ocr_pool(pool) -> None:
+    """Drop a broken pool so the next OCR call starts a fresh one."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        if _ocr_pool is pool:
+            _ocr_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ocr_images(payload: list) -> list:
+    """OCR rendered pages given as (mode, size, raw bytes), split into one tesseract batch per
+    pool worker. Results are returned in the same order as `payload`.
+    """
+    workers = min(OCR_POOL_WORKERS, len(payload))
+    if workers == 1:
+        return _ocr_image_batch(payload)
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    per_batch = -(-len(payload) // workers)
+    batches = [payload[i : i + per_batch] for i in range(0, len(payload), per_batch)]
+    pool = _get_ocr_pool()
+    try:
+        return [text for texts in pool.map(_ocr_image_batch, batches) for text in texts]
+    except BrokenProcessPool:
+        _discard_ocr_pool(pool)
+        raise
+
+
+def _ocr_pass(doc, pdf, page_numbers: list, resolution: int, text_parts: dict) -> list:
+    """OCR `page_numbers` at `resolution` into text_parts, OCR_WINDOW pages at a time.
+
+    Each page is reduced to the raw bytes the pool needs as soon as it's rendered, so at most one
+    window of pages is held in memory. Returns the inked pages that still read as nearly empty.
+    """
+    retry = []
+    for start in range(0, len(page_numbers), OCR_WINDOW):
+        rendered = []
+        payload = []
+        for i in page_numbers[start : start + OCR_WINDOW]:
+            try:
+                im = _render_page(doc, pdf.pages[i], i, resolution).convert("L")
+            except Exception:
+                continue
+            rendered.append((i, _ink_ratio(im) >= MIN_PAGE_INK))
+            # ship plain (mode, size, bytes) tuples so no pdfplumber objects get pickled
+            payload.append((im.mode, im.size, im.tobytes()))
+        if not payload:
+            continue
+
+        try:
+            texts = _ocr_images(payload)
+        except Exception:
+            # the pool itself failed: no OCR result for these pages, keep the native text
+            texts = [None] * len(payload)
+        del payload
+
+        for (i, inked), text in zip(rendered, texts):
+            if text is None:
+                continue
+            # text_parts[i] here can only be this page's OCR text from the previous pass
+            if i not in text_parts or len(text.strip()) > len(text_parts[i].strip()):
+                text_parts[i] = text
+            if inked and len(text.strip()) < MIN_PAGE_TEXT:
+                retry.append(i)
+    return retry
+
+
+def extract_text_from_pdf(path: str) -> str:
+    text_parts = {}
+    try:
+        with _open_pdf(path) as pdf:
+            ocr_pages = []
+            for i, page in enumerate(pdf.pages):
+                text = page.extract_text() or ""
+                if text.strip():
+                    # a native text layer, however short, is kept as is and never OCR'd
+                    text_parts[i] = text
                 else:
-                    # fallback: render page as image and OCR
-                    try:
-                        im = page.to_image(resolution=150).original
-                        text_parts.append(pytesseract.image_to_string(im))
-                    except Exception:
-                        continue
+                    # fallback: pages without a text layer are OCR'd after the first pass
+                    ocr_pages.append(i)
+
+            # grayscale at OCR_RESOLUTION first; inked pages that still come back nearly empty
+            # (usually small print) get one more try at OCR_RETRY_RESOLUTION, blank ones don't
+            with _open_rasterizer(path, pdf, ocr_pages) as doc:
+                for resolution in (OCR_RESOLUTION, OCR_RETRY_RESOLUTION):
+                    ocr_pages = _ocr_pass(doc, pdf, ocr_pages, resolution, text_parts)
     except Exception:
         return ""
-    return "\n".join(text_parts)
+    return "\n".join(text_parts[i] for i in sorted(text_parts))
 
 
 def extract_text_from_image(path: str) -> str:
     try:
         # lazy import to avoid import-time dependency errors
         from PIL import Image
-        import pytesseract
         img = Image.open(path)
+        api = _tess_api()
+        if api is not None:
+            # psm 3 (fully automatic) is tesseract's default, as used by pytesseract below
+            return _tess_ocr(api, img, 3, False)
+        import pytesseract
         return pytesseract.image_to_string(img)
     except Exception:
         return ""
 
 
+# Patterns used by the text parsers below, compiled once at import time
+_LEADING_PUNCT = re.compile(r"^[:\-\s]+")
+_LEADING_PIPE = re.compile(r"^[:\|\-\s]+")
+_MULTISPACE = re.compile(r"\s{2,}|\t")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+_WS = re.compile(r"\s+")
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+_URL = re.compile(r"https?://\S+")
+_EMAIL = re.compile(r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}")
+_EMAIL_TAIL = re.compile(r"@[^.\s]+$")
+_DOMAIN = re.compile(r"^[\w.-]+\.[a-z]{2,}$", re.IGNORECASE)
+_AO = re.compile(r"application\s*owner", re.IGNORECASE)
+_APM_HEAD = re.compile(r"Application\s*Portfolio\s*Management\s*Details", re.IGNORECASE)
+
+
 HEADING_KEYWORDS = [
     "Purpose",
     "Architects",
@@ -57,6 +314,53 @@ HEADING_KEYWORDS = [
 ]
 
 
+@lru_cache(maxsize=1)
+def _heading_automaton():
+    """Case-sensitive Aho-Corasick automaton over HEADING_KEYWORDS, or None without pyahocorasick."""
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for h in HEADING_KEYWORDS:
+        automaton.add_word(h, h)
+    automaton.make_automaton()
+    return automaton
+
+
+# Parsed results for recently seen texts (same document re-uploaded, UI retries), keyed by
+# (parser name, blake2b digest of the text). Bounded LRU shared by all request threads.
+PARSE_CACHE_SIZE = 256
+_parse_cache: OrderedDict = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+
+def _memoize_text(func):
+    """Memoize a pure `text -> dict` parser. Callers always get their own copy of the result."""
+
+    @wraps(func)
+    def wrapper(text: str) -> dict:
+        if not text:
+            return func(text)
+        key = (func.__name__, hashlib.blake2b(text.encode(), digest_size=16).digest())
+        with _parse_cache_lock:
+            cached = _parse_cache.get(key)
+            if cached is not None:
+                _parse_cache.move_to_end(key)
+                return dict(cached)
+
+        result = func(text)
+        with _parse_cache_lock:
+            _parse_cache[key] = dict(result)
+            if len(_parse_cache) > PARSE_CACHE_SIZE:
+                _parse_cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
+@_memoize_text
 def parse_cdr_text(text: str) -> dict:
     """
     Heuristic parser: finds known headings and captures text until the next heading.
@@ -71,14 +375,26 @@ def parse_cdr_text(text: str) -> dict:
     # Build map of heading positions
     positions = {}
     lowered = t
-    for h in HEADING_KEYWORDS:
-        idx = lowered.find(h)
+    heading_automaton = _heading_automaton()
+    if heading_automaton is not None:
+        # single scan of the text, keeping each heading's first occurrence
+        first = {}
+        for end, h in heading_automaton.iter(lowered):
+            if h not in first:
+                first[h] = end - len(h) + 1
+                if len(first) == len(HEADING_KEYWORDS):
+                    break
+        found = [(first.get(h, -1), h) for h in HEADING_KEYWORDS]
+    else:
+        found = [(lowered.find(h), h) for h in HEADING_KEYWORDS]
+    # headings sharing a start index resolve in HEADING_KEYWORDS order (last one wins)
+    for idx, h in found:
         if idx != -1:
             positions[idx] = h
 
     if not positions:
         # As fallback, try to split by blank-line separated paragraphs and return first chunk as body
-        paragraphs = [p.strip() for p in re.split(r"\n\s*\n", t) if p.strip()]
+        paragraphs = [p.strip() for p in _BLANK_LINES.split(t) if p.strip()]
         return {"body": paragraphs[0] if paragraphs else t}
 
     parsed = {}
@@ -91,13 +407,13 @@ def parse_cdr_text(text: str) -> dict:
         end = min(next_positions) if next_positions else len(t)
         content = t[start:end].strip()
         # clean up leading punctuation/newlines
-        content = re.sub(r"^[:\-\s]+", "", content)
+        content = _LEADING_PUNCT.sub("", content)
         parsed[heading] = content
 
     return parsed
 
 
-def extract_key_values(text: str, expected_keys: list | None = None) -> dict:
+def extract_key_values(text: str, expected_keys: list[str] | None = None) -> dict[str, str]:
     """
     Extract key/value pairs from a block of text.
     Recognizes patterns like:
@@ -109,34 +425,54 @@ def extract_key_values(text: str, expected_keys: list | None = None) -> dict:
     if not text:
         return {}
 
-    lines = [l.strip() for l in text.splitlines() if l.strip()]
-    result = {}
+    # strip each line once (map runs str.strip in C) and drop the blanks
+    lines: list[str] = [l for l in map(str.strip, text.splitlines()) if l]
+    result: dict[str, str] = {}
 
     # Prepare expected keys lookup (normalize to lowercase, longest-first)
-    ek_list = []
+    ek_list: list[str] = []
+    ek_norm: list[str] = []
+    automaton: Any = None
+    max_key_len = 0
     if expected_keys:
         # sort by length desc to prefer longer matches (e.g., 'Service offering' before 'Service')
         ek_list = sorted(expected_keys, key=lambda s: -len(s))
         ek_norm = [k.lower() for k in ek_list]
-    else:
-        ek_norm = []
-
-    last_key = None
+        automaton = _key_automaton(tuple(expected_keys))
+        max_key_len = len(ek_norm[0])
+
+    # bucket keys by first character (longest-first within each bucket) so the linear
+    # scans below only try keys that can possibly match
+    keys_by_char: dict[str, list[tuple[str, str]]] = {}
+    for ek, orig in zip(ek_norm, ek_list):
+        keys_by_char.setdefault(ek[:1], []).append((ek, orig))
+
+    last_key: str | None = None
+    orig_key = ""
+    free_idx = 0
     for line in lines:
         low = line.lower()
 
         # 0) If expected keys provided, try to match a key at the start of the line
         matched = False
-        for idx, ek in enumerate(ek_norm):
-            if low.startswith(ek):
-                orig_key = ek_list[idx]
-                value = line[len(orig_key) :].strip()
-                # if value starts with separator like ':' or '|' remove it
-                value = re.sub(r"^[:\|\-\s]+", "", value)
-                result[orig_key] = value
-                matched = True
-                break
+        if automaton is not None:
+            # single pass over the line head; keep the longest key anchored at position 0
+            best = 0
+            for end_idx, (klen, key) in automaton.iter(low[:max_key_len]):
+                if end_idx - klen + 1 == 0 and klen > best:
+                    best, orig_key = klen, key
+            matched = best > 0
+        else:
+            for ek, orig in keys_by_char.get(low[0], ()):
+                if low.startswith(ek):
+                    orig_key = orig
+                    matched = True
+                    break
         if matched:
+            value = line[len(orig_key) :].strip()
+            # if value starts with separator like ':' or '|' remove it
+            value = _LEADING_PIPE.sub("", value)
+            result[orig_key] = value
             last_key = orig_key
             continue
 
@@ -148,7 +484,7 @@ def extract_key_values(text: str, expected_keys: list | None = None) -> dict:
             continue
 
         # 2) multiple spaces or tabs separation
-        parts = re.split(r"\s{2,}|\t", line, maxsplit=1)
+        parts = _MULTISPACE.split(line, maxsplit=1)
         if len(parts) == 2:
             k, v = parts
             result[k.strip()] = v.strip()
@@ -157,12 +493,13 @@ def extract_key_values(text: str, expected_keys: list | None = None) -> dict:
 
         # 3) fallback: try to split by first space and see if left matches an expected key
         if " " in line and ek_norm:
-            first_word = line.split(" ", 1)[0].lower()
-            for idx, ek in enumerate(ek_norm):
+            # reuse the already-lowered line instead of split()+lower() on every line
+            first_word = low[: low.find(" ")]
+            for ek, orig in keys_by_char.get(first_word[0], ()):
                 if ek.startswith(first_word):
-                    orig_key = ek_list[idx]
+                    orig_key = orig
                     value = line[len(orig_key) :].strip()
-                    value = re.sub(r"^[:\|\-\s]+", "", value)
+                    value = _LEADING_PIPE.sub("", value)
                     if value:
                         result[orig_key] = value
                         matched = True
@@ -189,33 +526,79 @@ def extract_key_values(text: str, expected_keys: list | None = None) -> dict:
                 appended = True
             else:
                 # If previous looks like an email fragment (contains @ but no dot after @), stitch without space
-                if isinstance(prev, str) and "@" in prev and re.search(r"@[^.\s]+$", prev):
+                if "@" in prev and _EMAIL_TAIL.search(prev):
                     result[last_key] = prev + line
                     appended = True
                 # If this line looks like a domain fragment (no spaces, contains a dot) and previous contains '@', stitch
-                elif "@" in str(prev) and re.match(r"^[\w.-]+\.[a-z]{2,}$", line.strip(), re.IGNORECASE):
+                elif "@" in prev and _DOMAIN.match(line.strip()):
                     result[last_key] = prev + line.strip()
                     appended = True
                 # If line contains pipe separators or looks like continuation text, append with space
-                elif "|" in line or (":" not in line and not re.search(r"\s{2,}|\t", line)):
+                elif "|" in line or (":" not in line and not _MULTISPACE.search(line)):
                     result[last_key] = prev + " " + line
                     appended = True
 
         if appended:
             continue
 
-        # fallback: append to a free-text key
-        idx = 0
-        base = "text"
-        key = f"{base}_{idx}"
+        # fallback: append to a free-text key. free_idx only moves forward (text_* keys are
+        # never removed), so this no longer rescans text_0, text_1, ... for every line
+        key = f"text_{free_idx}"
         while key in result:
-            idx += 1
-            key = f"{base}_{idx}"
+            free_idx += 1
+            key = f"text_{free_idx}"
+        free_idx += 1
         result[key] = line
         last_key = key
 
     return result
 
+APM_EXPECTED_KEYS = [
+    "Details",
+    "Service offering",
+    "Automated Service",
+    "Environment",
+    "APM Name",
+    "APM ID",
+    "MIO",
+    "Business Unit",
+    "Application Owner",
+    "Compliance",
+    "Application Service Level commitment",
+    "Strategic Project ID",
+    "Operational Project ID",
+    "PMS ID",
+    "Backup Policy",
+    "Network Zone",
+    "Patching Wave",
+]
+
+
+@lru_cache(maxsize=32)
+def _key_automaton(keys: tuple):
+    """Aho-Corasick automaton over the lowercased keys, or None when pyahocorasick is missing
+    or no key is non-empty (an automaton without words can't be searched).
+
+    Each word maps to (len(lowercased key), original key). Keys are added longest-first and
+    the first of any case-insensitive duplicates wins, mirroring the linear scans it replaces.
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for k in sorted(keys, key=lambda s: -len(s)):
+        low = k.lower()
+        if low and low not in automaton:
+            automaton.add_word(low, (len(low), k))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+@_memoize_text
 def extract_apm_from_text(text: str) -> dict:
     """
     Extract APM / Labels / Tagging related key/value items from a large block of text.
@@ -232,8 +615,7 @@ def extract_apm_from_text(text: str) -> dict:
     t = text.replace('\r', '')
 
     # 1) locate heading
-    heading_regex = re.compile(r"Application\s*Portfolio\s*Management\s*Details", re.IGNORECASE)
-    m = heading_regex.search(t)
+    m = _APM_HEAD.search(t)
     block = None
     if m:
         start = m.end()
@@ -254,36 +636,21 @@ def extract_apm_from_text(text: str) -> dict:
         block = "\n".join(take)
 
     # 2) fallback: try to extract lines containing known APM keys
-    expected_keys = [
-        "Details",
-        "Service offering",
-        "Automated Service",
-        "Environment",
-        "APM Name",
-        "APM ID",
-        "MIO",
-        "Business Unit",
-        "Application Owner",
-        "Compliance",
-        "Application Service Level commitment",
-        "Strategic Project ID",
-        "Operational Project ID",
-        "PMS ID",
-        "Backup Policy",
-        "Network Zone",
-        "Patching Wave",
-    ]
+    expected_keys = APM_EXPECTED_KEYS
 
     if not block:
         lines = t.splitlines()
         candidates = []
+        automaton = _key_automaton(tuple(expected_keys))
         for i, ln in enumerate(lines):
             low = ln.lower()
-            for ek in expected_keys:
-                if ek.lower() in low:
-                    # collect this line plus the next N lines as context (increased from 3 -> 10)
-                    context = lines[i : i + 10 + 1]
-                    candidates.extend(context)
+            if automaton is not None:
+                hits = len({key for _, (_, key) in automaton.iter(low)})
+            else:
+                hits = sum(1 for ek in expected_keys if ek.lower() in low)
+            # collect this line plus the next N lines as context (increased from 3 -> 10), once per key found
+            for _ in range(hits):
+                candidates.extend(lines[i : i + 10 + 1])
         if candidates:
             block = "\n".join(candidates)
 
@@ -292,7 +659,7 @@ def extract_apm_from_text(text: str) -> dict:
         block = t
 
     # Clean HTML artifacts if any (e.g., from copy/paste containing links) - keep mailto:
-    block = re.sub(r"https?://\S+", "", block)
+    block = _URL.sub("", block)
 
     # Parse block into key/value pairs (give expected keys to help proper splitting)
     kv = extract_key_values(block, expected_keys=expected_keys)
@@ -300,17 +667,17 @@ def extract_apm_from_text(text: str) -> dict:
     # Post-process keys: normalize spacing and capitalization; also pipe->comma, collapse spaces
     cleaned = {}
     for k, v in kv.items():
-        clean_k = re.sub(r"\s+", " ", k).strip()
+        clean_k = _WS.sub(" ", k).strip()
         if isinstance(v, str):
             val = v.replace("|", ",")
-            val = re.sub(r"\s+", " ", val).strip()
+            val = _WS.sub(" ", val).strip()
         else:
             val = v
         cleaned[clean_k] = val
 
     # Build final output that contains ONLY the expected keys (preserve order)
     def normalize_key(s: str) -> str:
-        return re.sub(r"[^a-z0-9]", "", s.lower())
+        return _NON_ALNUM.sub("", s.lower())
 
     cleaned_norm_map = {normalize_key(k): k for k in cleaned.keys()}
 
@@ -328,20 +695,19 @@ def extract_apm_from_text(text: str) -> dict:
         If not found, return the first email found anywhere in the block.
         Never search the entire document to avoid picking unrelated emails.
         """
-        email_re = re.compile(r"[\w\.-]+@[\w\.-]+\.[a-zA-Z]{2,}")
         lines = blk.splitlines()
 
         # 1) Look near the 'Application Owner' line(s)
         for i, ln in enumerate(lines):
-            if re.search(r"application\s*owner", ln, re.IGNORECASE):
+            if _AO.search(ln):
                 # search within the window after the key line
                 window = "\n".join(lines[i : i + max_lines_after + 1])
-                m_email = email_re.search(window)
+                m_email = _EMAIL.search(window)
                 if m_email:
                     return m_email.group(0)
 
         # 2) Otherwise, take any email present within the block (still scoped)
-        m_any = email_re.search(blk)
+        m_any = _EMAIL.search(blk)
         if m_any:
             return m_any.group(0)
 
@@ -516,7 +882,7 @@ def extract_technical_table(text: str) -> dict:
 
     # consolidate into interim dict
     interim = {}
-    name_count = {}
+    name_count: dict[str, int] = {}
     for r in rows:
         label = r.get("Environment", "Unknown")
         key = label